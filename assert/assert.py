@@ -1,98 +1,193 @@
+import os
 import re
+import sys
 import math
-import types
-import inspect
-import builtins
-from typing import Any, Optional, Union, Callable, Pattern, Type, Tuple, Dict, List
+import linecache
+from typing import Any, Optional, Union, Callable, Pattern, Type, Dict
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Stack capture is off unless ASSERTION_CAPTURE_STACK is set (to anything but
+# '0') or Assert.set_capture_stack(True); AssertError.stack is None when disabled
+_CAPTURE_STACK = os.environ.get('ASSERTION_CAPTURE_STACK', '').strip() not in ('', '0')
+
+# Operator names and error codes shared by every raise site
+_OP_EQUAL = sys.intern('==')
+_OP_STRICT_EQUAL = sys.intern('strictEqual')
+_OP_NOT_STRICT_EQUAL = sys.intern('notStrictEqual')
+_OP_FAIL = sys.intern('fail')
+_OP_THROWS = sys.intern('throws')
+_OP_DOES_NOT_THROW = sys.intern('doesNotThrow')
+_OP_IF_ERROR = sys.intern('ifError')
+_OP_DEEP = sys.intern('deepStrictEqual')
+_OP_NOT_DEEP = sys.intern('notDeepStrictEqual')
+_CODE = sys.intern('ERR_ASSERTION')
+_NAME = sys.intern('AssertError')
+
+# BaseException's own args descriptor, used by AssertError.args
+_EXCEPTION_ARGS = BaseException.args
 
 class AssertError(Exception):
+    __slots__ = (
+        'generated_message', 'code', 'actual', 'expected', 'operator', 'name',
+        '_message', '_formatter', '_frames', '_stack_str'
+    )
+
     def __init__(
         self,
         message: Optional[str] = None,
         actual: Any = None,
         expected: Any = None,
-        operator: str = 'fail',
+        operator: str = _OP_FAIL,
         generated_message: bool = False,
-        stack_start_fn: Optional[Callable] = None
+        stack_start_fn: Optional[Callable] = None,
+        formatter: Optional[Callable[['AssertError'], str]] = None
     ):
         if message is None:
-            if operator == 'fail':
+            if operator == _OP_FAIL:
                 message = 'Assertion failed.'
-            else:
-                actual_str = stringify(actual)
-                expected_str = stringify(expected)
-                message = f'{actual_str} {operator} {expected_str}'
             generated_message = True
 
-        super().__init__(message)
+        # Generated messages are formatted on first read of .message, .args,
+        # str() or repr(), so actual and expected are not stringified unless
+        # the error is displayed
+        if message is None:
+            super().__init__()
+            self._formatter = formatter or _format_comparison
+        else:
+            super().__init__(message)
+            self._formatter = None
+        self._message = message
 
         self.generated_message = generated_message
-        self.code = 'ERR_ASSERTION'
+        self.code = _CODE
         self.actual = actual
         self.expected = expected
         self.operator = operator
-        self.name = 'AssertError'
-
-        # Capture stack trace
-        if stack_start_fn:
-            try:
-                # Remove current function from stack
-                stack = inspect.stack()
-                start_index = 0
-                for i, frame in enumerate(stack):
-                    if frame.function == stack_start_fn.__name__:
-                        start_index = i + 1
-                        break
-                self.stack = ''.join(frame[4] for frame in stack[start_index:])
-            except Exception:
-                pass
+        self.name = _NAME
+
+        # Snapshot (filename, lineno) pairs now, so the error holds no live
+        # frames; source lines are only read when .stack is accessed
+        self._stack_str = None
+        self._frames = None
+        if stack_start_fn and _CAPTURE_STACK:
+            target_code = getattr(stack_start_fn, '__code__', None)
+            start = sys._getframe(1)
+            # Skip frames up to and including stack_start_fn, or keep the
+            # whole stack when it is not found
+            frame = start
+            while frame and frame.f_code is not target_code:
+                frame = frame.f_back
+            frame = frame.f_back if frame else start
+            frames = []
+            while frame:
+                frames.append((frame.f_code.co_filename, frame.f_lineno))
+                frame = frame.f_back
+            self._frames = frames
+
+    @property
+    def stack(self) -> Optional[str]:
+        if self._frames is not None:
+            self._stack_str = ''.join(
+                linecache.getline(filename, lineno)
+                for filename, lineno in self._frames
+            )
+            self._frames = None
+        return self._stack_str
+
+    @property
+    def message(self) -> str:
+        if self._message is None:
+            self._message = self._formatter(self)
+        return self._message
+
+    @property
+    def args(self) -> tuple:
+        if self._formatter is not None:
+            _EXCEPTION_ARGS.__set__(self, (self.message,))
+            self._formatter = None
+        return _EXCEPTION_ARGS.__get__(self)
+
+    @args.setter
+    def args(self, value: tuple) -> None:
+        _EXCEPTION_ARGS.__set__(self, value)
+        self._formatter = None
+        self._message = Exception.__str__(self)
+
+    def __reduce__(self):
+        # Slot attributes are not part of BaseException's pickled state
+        state = dict(getattr(self, '__dict__', None) or {})
+        state['_stack_str'] = self.stack
+        return (
+            type(self),
+            (self.message, self.actual, self.expected, self.operator, self.generated_message),
+            state
+        )
 
     def __str__(self) -> str:
-        return f'{self.name} [{self.code}]: {super().__str__()}'
+        return f'{self.name} [{self.code}]: {self.message}'
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.message!r})'
+
+def _format_comparison(err: AssertError) -> str:
+    return f'{stringify(err.actual)} {err.operator} {stringify(err.expected)}'
+
+def _format_if_error(err: AssertError) -> str:
+    return f'ifError got unwanted exception: {stringify(err.actual)}'
 
 def assert_(value: Any, message: Optional[Union[str, Exception]] = None) -> None:
-    if not value:
-        generated_message = False
-        if message is None:
-            message = 'Assertion failed.' if value is not None else 'No value argument passed to `assert()`.'
-            generated_message = True
-        elif isinstance(message, Exception):
-            raise message
-
-        raise AssertionError(
-            message=message,
-            actual=value,
-            expected=True,
-            operator='==',
-            generated_message=generated_message,
-            stack_start_fn=assert_
-        )
+    if value:
+        return
+    _assert_raise(value, message)
+
+def _assert_raise(value: Any, message: Optional[Union[str, Exception]]) -> None:
+    generated_message = False
+    if message is None:
+        message = 'Assertion failed.' if value is not None else 'No value argument passed to `assert()`.'
+        generated_message = True
+    elif isinstance(message, Exception):
+        raise message
+
+    raise AssertError(
+        message=message,
+        actual=value,
+        expected=True,
+        operator=_OP_EQUAL,
+        generated_message=generated_message,
+        stack_start_fn=assert_
+    )
+
+def _compare_raise(
+    actual: Any,
+    expected: Any,
+    message: Optional[Union[str, Exception]],
+    operator: str,
+    stack_start_fn: Callable
+) -> None:
+    if isinstance(message, Exception):
+        raise message
+
+    raise AssertError(
+        message=message,
+        actual=actual,
+        expected=expected,
+        operator=operator,
+        stack_start_fn=stack_start_fn
+    )
 
 def equal(actual: Any, expected: Any, message: Optional[Union[str, Exception]] = None) -> None:
-    if not object_is(actual, expected):
-        if isinstance(message, Exception):
-            raise message
-            
-        raise AssertionError(
-            message=message,
-            actual=actual,
-            expected=expected,
-            operator='strictEqual',
-            stack_start_fn=equal
-        )
+    if object_is(actual, expected):
+        return
+    _compare_raise(actual, expected, message, _OP_STRICT_EQUAL, equal)
 
 def not_equal(actual: Any, expected: Any, message: Optional[Union[str, Exception]] = None) -> None:
-    if object_is(actual, expected):
-        if isinstance(message, Exception):
-            raise message
-            
-        raise AssertionError(
-            message=message,
-            actual=actual,
-            expected=expected,
-            operator='notStrictEqual',
-            stack_start_fn=not_equal
-        )
+    if not object_is(actual, expected):
+        return
+    _compare_raise(actual, expected, message, _OP_NOT_STRICT_EQUAL, not_equal)
 
 def fail(message: Optional[Union[str, Exception]] = None) -> None:
     generated_message = False
@@ -102,11 +197,11 @@ def fail(message: Optional[Union[str, Exception]] = None) -> None:
     elif isinstance(message, Exception):
         raise message
 
-    raise AssertionError(
+    raise AssertError(
         message=message,
         actual=False,
         expected=True,
-        operator='fail',
+        operator=_OP_FAIL,
         generated_message=generated_message,
         stack_start_fn=fail
     )
@@ -127,11 +222,11 @@ def throws(
         err = e
 
     if not thrown:
-        raise AssertionError(
+        raise AssertError(
             message=message or 'Missing expected exception.',
             actual=None,
             expected=expected,
-            operator='throws',
+            operator=_OP_THROWS,
             generated_message=message is None,
             stack_start_fn=throws
         )
@@ -151,11 +246,11 @@ def does_not_throw(
         func()
     except Exception as e:
         if test_error(e, expected, message, does_not_throw):
-            raise AssertionError(
+            raise AssertError(
                 message=message or 'Got unwanted exception.',
                 actual=e,
                 expected=expected,
-                operator='doesNotThrow',
+                operator=_OP_DOES_NOT_THROW,
                 generated_message=message is None,
                 stack_start_fn=does_not_throw
             ) from None
@@ -163,41 +258,24 @@ def does_not_throw(
 
 def if_error(err: Optional[Exception]) -> None:
     if err is not None:
-        msg = f'ifError got unwanted exception: {stringify(err)}'
-        raise AssertionError(
-            message=msg,
+        raise AssertError(
             actual=err,
             expected=None,
-            operator='ifError',
+            operator=_OP_IF_ERROR,
             generated_message=True,
-            stack_start_fn=if_error
+            stack_start_fn=if_error,
+            formatter=_format_if_error
         )
 
 def deep_equal(actual: Any, expected: Any, message: Optional[str] = None) -> None:
-    if not is_deep_equal(actual, expected):
-        if isinstance(message, Exception):
-            raise message
-            
-        raise AssertionError(
-            message=message,
-            actual=actual,
-            expected=expected,
-            operator='deepStrictEqual',
-            stack_start_fn=deep_equal
-        )
+    if is_deep_equal(actual, expected):
+        return
+    _compare_raise(actual, expected, message, _OP_DEEP, deep_equal)
 
 def not_deep_equal(actual: Any, expected: Any, message: Optional[str] = None) -> None:
-    if is_deep_equal(actual, expected):
-        if isinstance(message, Exception):
-            raise message
-            
-        raise AssertionError(
-            message=message,
-            actual=actual,
-            expected=expected,
-            operator='notDeepStrictEqual',
-            stack_start_fn=not_deep_equal
-        )
+    if not is_deep_equal(actual, expected):
+        return
+    _compare_raise(actual, expected, message, _OP_NOT_DEEP, not_deep_equal)
 
 def enforce(value: Any, name: Optional[str] = None, type_name: Optional[str] = None) -> None:
     if not value:
@@ -215,72 +293,210 @@ def range_(value: Any, name: Optional[str] = None) -> None:
         raise ValueError(msg)
 
 # Helper functions
+# Buffers are included since their == is a C-level memcmp
+_PRIMITIVE_TYPES = frozenset({str, int, bool, type(None), bytes, bytearray, memoryview})
+
 def object_is(a: Any, b: Any) -> bool:
     """Mimic JavaScript's Object.is() behavior"""
     if a is b:
         return True
-    
-    # Handle NaN
-    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+
+    # Handle NaN, the only value not equal to itself
+    if a != a and b != b:
         return True
-    
+
     # Handle signed zeros
-    if a == 0 and b == 0 and (1/a > 0) != (1/b > 0):
-        return False
-    
+    if a == 0 and b == 0:
+        try:
+            return math.copysign(1, a) == math.copysign(1, b)
+        except TypeError:
+            pass
+
     return a == b
 
+def _stringify_str(value: str) -> str:
+    if len(value) > 80:
+        return repr(value[:80] + '...')
+    return repr(value)
+
+def _stringify_coll(value: Union[list, tuple, set, dict]) -> str:
+    return f'{type(value).__name__}({len(value)})'
+
+# Exact-type formatters; subclasses fall back to the isinstance chain
+_STRINGIFY: Dict[type, Callable[[Any], str]] = {
+    type(None): lambda v: 'null',
+    bool: str,
+    int: str,
+    float: str,
+    str: _stringify_str,
+    bytes: lambda v: f'bytes({len(v)})',
+    list: _stringify_coll,
+    tuple: _stringify_coll,
+    set: _stringify_coll,
+    dict: _stringify_coll,
+}
+
 def stringify(value: Any) -> str:
     """Convert value to descriptive string"""
-    if value is None:
-        return 'null'
+    fn = _STRINGIFY.get(type(value))
+    if fn is not None:
+        return fn(value)
     if isinstance(value, bool):
         return str(value)
     if isinstance(value, (int, float)):
         return str(value)
     if isinstance(value, str):
-        return repr(value[:80] + '...' if len(value) > 80 else value)
+        return _stringify_str(value)
     if isinstance(value, bytes):
         return f'bytes({len(value)})'
     if isinstance(value, (list, tuple, set, dict)):
-        return f'{type(value).__name__}({len(value)})'
+        return _stringify_coll(value)
     if hasattr(value, '__name__'):
         return f'function {value.__name__}'
-    return repr(value)[:80] + ('...' if len(repr(value)) > 80 else '')
+    r = repr(value)
+    return r[:80] + ('...' if len(r) > 80 else '')
 
-def is_deep_equal(a: Any, b: Any) -> bool:
-    """Recursive deep equality check"""
-    if object_is(a, b):
-        return True
-    
-    if type(a) is not type(b):
+def _primitive_seq_equal(a: Union[list, tuple], b: Union[list, tuple]) -> Optional[bool]:
+    """Compare sequences of primitives with the C-level ==, None if not all primitive"""
+    types_a = list(map(type, a))
+    if types_a != list(map(type, b)):
         return False
-    
-    # Handle collections
-    if isinstance(a, (list, tuple)):
-        if len(a) != len(b):
-            return False
-        return all(is_deep_equal(x, y) for x, y in zip(a, b))
-    
-    if isinstance(a, dict):
-        if set(a.keys()) != set(b.keys()):
-            return False
-        return all(is_deep_equal(a[k], b[k]) for k in a)
-    
-    # Handle sets
-    if isinstance(a, set):
-        return a == b
-    
-    # Handle bytes
-    if isinstance(a, bytes):
-        return a == b
-    
-    # Handle custom objects
-    if hasattr(a, '__dict__') and hasattr(b, '__dict__'):
-        return is_deep_equal(a.__dict__, b.__dict__)
-    
+    # Floats are left to the walk for NaN and signed zero handling
+    if not _PRIMITIVE_TYPES.issuperset(types_a):
+        return None
     return a == b
 
+_NUMERIC_TYPES = (int, float)
+_NUMPY_MIN_LEN = 64
+
+def _numeric_array_equal(a: Union[list, tuple], b: Union[list, tuple]) -> Optional[bool]:
+    """Vectorized compare of all-int or all-float sequences, None if numpy can't take them"""
+    types_a = list(map(type, a))
+    if types_a != list(map(type, b)):
+        return False
+
+    # Mixed int/float would be coerced to float64 and lose precision
+    kind = types_a[0]
+    if kind not in _NUMERIC_TYPES or types_a.count(kind) != len(types_a):
+        return None
+    try:
+        x = np.asarray(a, dtype=np.float64 if kind is float else np.int64)
+        y = np.asarray(b, dtype=x.dtype)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+    if kind is int:
+        return np.array_equal(x, y)
+
+    # Same rule as object_is: any NaN equals any NaN, signed zeros differ
+    nan_x = np.isnan(x)
+    if not np.array_equal(nan_x, np.isnan(y)):
+        return False
+    same = (x == y) & (np.signbit(x) == np.signbit(y))
+    return bool((nan_x | same).all())
+
+def is_deep_equal(a: Any, b: Any) -> bool:
+    """Iterative deep equality check"""
+    stack = [(a, b)]
+    # Container pairs already queued, so cyclic structures terminate
+    seen = set()
+    while stack:
+        a, b = stack.pop()
+        if a is b:
+            continue
+
+        t = type(a)
+        if t is not type(b):
+            return False
+
+        # Primitives and buffers compare with plain ==
+        if t in _PRIMITIVE_TYPES:
+            if a != b:
+                return False
+            continue
+
+        # Floats need the NaN and signed zero handling of object_is
+        if t is float:
+            if not object_is(a, b):
+                return False
+            continue
+
+        # Handle collections
+        if isinstance(a, (list, tuple)):
+            if len(a) != len(b):
+                return False
+            if a and type(a[0]) in _PRIMITIVE_TYPES and type(a[-1]) is type(a[0]):
+                result = _primitive_seq_equal(a, b)
+                if result is not None:
+                    if not result:
+                        return False
+                    continue
+            if (np is not None and len(a) > _NUMPY_MIN_LEN
+                    and type(a[0]) in _NUMERIC_TYPES
+                    and type(a[-1]) in _NUMERIC_TYPES):
+                result = _numeric_array_equal(a, b)
+                if result is not None:
+                    if not result:
+                        return False
+                    continue
+            pair = (id(a), id(b))
+            if pair not in seen:
+                seen.add(pair)
+                stack.extend(zip(a, b))
+            continue
+
+        if isinstance(a, dict):
+            if len(a) != len(b):
+                return False
+            pair = (id(a), id(b))
+            if pair not in seen:
+                seen.add(pair)
+                for k, v in a.items():
+                    if k not in b:
+                        return False
+                    stack.append((v, b[k]))
+            continue
+
+        # Handle sets
+        if isinstance(a, set):
+            if a != b:
+                return False
+            continue
+
+        # Handle custom objects
+        if a == b:
+            continue
+        if hasattr(a, '__dict__') and hasattr(b, '__dict__'):
+            da, db = vars(a), vars(b)
+            if len(da) != len(db):
+                return False
+            pair = (id(a), id(b))
+            if pair not in seen:
+                seen.add(pair)
+                for k, v in da.items():
+                    if k not in db:
+                        return False
+                    stack.append((v, db[k]))
+            continue
+
+        return False
+
+    return True
+
+_CLASSIFY: Dict[type, str] = {
+    type(re.compile('')): 'pattern',
+    dict: 'dict',
+}
+
+def _classify_fallback(expected: Any) -> Optional[str]:
+    if isinstance(expected, type) and issubclass(expected, Exception):
+        return 'type'
+    if callable(expected):
+        return 'callable'
+    if isinstance(expected, dict):
+        return 'dict'
+    return None
+
 def test_error(
     err: Exception,
     expected: Union[Type[Exception], Callable, Pattern, dict],
@@ -288,28 +504,30 @@ def test_error(
     fn: Callable
 ) -> bool:
     """Test if error matches expected criteria"""
+    kind = _CLASSIFY.get(type(expected)) or _classify_fallback(expected)
+
     # Handle error type
-    if isinstance(expected, type) and issubclass(expected, Exception):
+    if kind == 'type':
         return isinstance(err, expected)
-    
+
     # Handle regex pattern
-    if isinstance(expected, Pattern):
+    if kind == 'pattern':
         return bool(expected.search(str(err)))
-    
+
     # Handle validation function
-    if callable(expected):
+    if kind == 'callable':
         try:
             return bool(expected(err))
         except Exception:
             return False
-    
+
     # Handle error properties (dict)
-    if isinstance(expected, dict):
+    if kind == 'dict':
         for key, value in expected.items():
             if not hasattr(err, key) or not is_deep_equal(getattr(err, key), value):
                 return False
         return True
-    
+
     return False
 
 # Alias functions to match Node.js names
@@ -333,24 +551,33 @@ __all__ = [
     'not_deep_strict_equal'
 ]
 
-class Assert:
-    AssertError = AssertError
-    assert = assert_
-    strict = assert_
-    ok = assert_
-    equal = equal
-    notEqual = not_equal
-    strictEqual = strict_equal
-    notStrictEqual = not_strict_equal
-    fail = fail
-    throws = throws
-    doesNotThrow = does_not_throw
-    ifError = if_error
-    deepEqual = deep_equal
-    notDeepEqual = not_deep_equal
-    deepStrictEqual = deep_strict_equal
-    notDeepStrictEqual = not_deep_strict_equal
-    enforce = enforce
-    range = range_
+def _set_capture_stack(cls, enabled: bool) -> None:
+    global _CAPTURE_STACK
+    _CAPTURE_STACK = bool(enabled)
+
+# `assert` is a keyword, so the namespace is built from a dict
+Assert = type('Assert', (), {
+    'AssertError': AssertError,
+    'set_capture_stack': classmethod(_set_capture_stack),
+    **{name: staticmethod(fn) for name, fn in {
+        'assert': assert_,
+        'strict': assert_,
+        'ok': assert_,
+        'equal': equal,
+        'notEqual': not_equal,
+        'strictEqual': strict_equal,
+        'notStrictEqual': not_strict_equal,
+        'fail': fail,
+        'throws': throws,
+        'doesNotThrow': does_not_throw,
+        'ifError': if_error,
+        'deepEqual': deep_equal,
+        'notDeepEqual': not_deep_equal,
+        'deepStrictEqual': deep_strict_equal,
+        'notDeepStrictEqual': not_deep_strict_equal,
+        'enforce': enforce,
+        'range': range_,
+    }.items()},
+})
 
 assertion = Assert()
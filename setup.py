@@ -10,5 +10,6 @@ setup(name='assertion',
       author='JJGG',
       license='MIT',
       install_requires=[],
+      extras_require={'numpy': ['numpy>=1.19']},
       python_requires='>=3.6',
 )
\ No newline at end of file
@@ -0,0 +1,101 @@
+import sys
+import pickle
+import unittest
+import importlib.util
+from pathlib import Path
+
+# The package directory is named `assert`, which is a keyword, so load the
+# module from its path
+_spec = importlib.util.spec_from_file_location(
+    'assertion', Path(__file__).resolve().parent.parent / 'assert' / 'assert.py'
+)
+assertion = importlib.util.module_from_spec(_spec)
+sys.modules['assertion'] = assertion
+_spec.loader.exec_module(assertion)
+
+is_deep_equal = assertion.is_deep_equal
+
+NAN = float('nan')
+
+
+@unittest.skipIf(assertion.np is None, 'numpy is not installed')
+class NumericArrayEqualTest(unittest.TestCase):
+    def test_mixed_int_float_keeps_int_precision(self):
+        prefix = [0.5] + list(range(100))
+        self.assertFalse(is_deep_equal(prefix + [2**60 + 1], prefix + [2**60]))
+        self.assertTrue(is_deep_equal(prefix + [2**60], prefix + [2**60]))
+
+    def test_result_does_not_depend_on_length(self):
+        for n in (10, 100):
+            a = [0.5] + list(range(n)) + [2**60 + 1]
+            b = [0.5] + list(range(n)) + [2**60]
+            self.assertFalse(is_deep_equal(a, b), n)
+
+    def test_element_types_must_match(self):
+        self.assertFalse(is_deep_equal([1.0] * 100, [1.0] * 99 + [1]))
+        self.assertFalse(is_deep_equal([1] * 100, [1] * 99 + [True]))
+
+    def test_ints(self):
+        self.assertTrue(is_deep_equal(list(range(100)), list(range(100))))
+        self.assertFalse(is_deep_equal(list(range(100)), list(range(99)) + [0]))
+        self.assertTrue(is_deep_equal([1] * 99 + [2**70], [1] * 99 + [2**70]))
+        self.assertFalse(is_deep_equal([1] * 99 + [2**70], [1] * 99 + [2**70 + 1]))
+
+    def test_floats_match_object_is(self):
+        self.assertTrue(is_deep_equal([NAN] * 70, [-NAN] * 70))
+        self.assertFalse(is_deep_equal([0.0] * 70, [0.0] * 69 + [-0.0]))
+        self.assertFalse(is_deep_equal([1.5] * 70, [1.5] * 69 + [NAN]))
+        for n in (10, 70):
+            self.assertEqual(
+                is_deep_equal([NAN] * n, [-NAN] * n),
+                all(assertion.object_is(x, y) for x, y in zip([NAN] * n, [-NAN] * n))
+            )
+
+
+class AssertErrorArgsTest(unittest.TestCase):
+    def _raise(self, fn, *args):
+        with self.assertRaises(assertion.AssertError) as cm:
+            fn(*args)
+        return cm.exception
+
+    def test_generated_message_fills_args(self):
+        err = self._raise(assertion.equal, 1, 2)
+        self.assertEqual(err.args, ('1 strictEqual 2',))
+        self.assertEqual(str(err), 'AssertError [ERR_ASSERTION]: 1 strictEqual 2')
+
+    def test_message_is_not_formatted_until_read(self):
+        calls = []
+
+        class Value:
+            def __repr__(self):
+                calls.append(1)
+                return 'Value()'
+
+        err = self._raise(assertion.equal, Value(), 1)
+        self.assertEqual(calls, [])
+        self.assertEqual(err.args[0], 'Value() strictEqual 1')
+        self.assertEqual(calls, [1])
+
+    def test_pickle_round_trip(self):
+        err = self._raise(assertion.equal, 1, 2)
+        copy = pickle.loads(pickle.dumps(err))
+        self.assertEqual(copy.args, err.args)
+        self.assertEqual((copy.actual, copy.expected, copy.operator), (1, 2, 'strictEqual'))
+
+    def test_if_error_message(self):
+        err = self._raise(assertion.if_error, ValueError('boom'))
+        self.assertEqual(err.args, ("ifError got unwanted exception: ValueError('boom')",))
+
+    def test_explicit_message(self):
+        err = self._raise(assertion.equal, 1, 2, 'custom')
+        self.assertEqual(err.args, ('custom',))
+        self.assertFalse(err.generated_message)
+
+    def test_setting_args_updates_message(self):
+        err = self._raise(assertion.equal, 1, 2)
+        err.args = ('changed',)
+        self.assertEqual(str(err), 'AssertError [ERR_ASSERTION]: changed')
+
+
+if __name__ == '__main__':
+    unittest.main()